@@ -4,8 +4,6 @@ from typing import Set
 
 from loguru import logger
 
-# Only used for type hints, package-relative import not possible due to circular reference
-import orchestra.model.configuration
 from .util import run_user_script, run_internal_script, get_script_output
 from .util import try_run_internal_script, try_get_script_output
 
@@ -1,11 +1,17 @@
 import os
+from functools import cached_property
 from pathlib import Path
+from typing import Dict
 
 from loguru import logger
 
 from .action import ActionForBuild
 from ..exceptions import UserException
 
+# Caches the result of stat-ing the .configure_successful sentinels, as the executor
+# re-checks them many times while solving and scheduling the dependency graph
+_configure_successful_cache: Dict[Path, bool] = {}
+
 
 class ConfigureAction(ActionForBuild):
     def __init__(self, build, script, config):
@@ -13,13 +19,19 @@ class ConfigureAction(ActionForBuild):
 
     def is_satisfied(self):
         # TODO: invalidate configure if recursive_hash has changed
-        return os.path.exists(self._configure_successful_path)
+        sentinel_path = self._configure_successful_path
+        satisfied = _configure_successful_cache.get(sentinel_path)
+        if satisfied is None:
+            satisfied = os.path.isfile(sentinel_path)
+            _configure_successful_cache[sentinel_path] = satisfied
+        return satisfied
 
     def _run(self, explicitly_requested=False):
-        if self._configure_successful_path.exists():
+        if self._configure_successful_path.is_file():
             logger.warning("This component was already successfully configured, rerunning configure script")
             os.remove(self._configure_successful_path)
-        elif os.path.exists(self.environment["BUILD_DIR"]):
+            _configure_successful_cache[self._configure_successful_path] = False
+        elif os.path.isdir(self.build_dir):
             logger.warning("Previous configure probably failed, running configure script in a dirty environment")
             logger.warning(
                 f"You might want to delete the build directory (use `orchestra clean {self.build.qualified_name}`)"
@@ -27,14 +39,15 @@ class ConfigureAction(ActionForBuild):
 
         self._run_user_script(self.script)
 
-        if self._configure_successful_path.parent.exists():
+        if self._configure_successful_path.parent.is_dir():
             self._configure_successful_path.touch()
+            _configure_successful_cache[self._configure_successful_path] = True
         else:
             raise UserException(f"{self._configure_successful_path.parent} was not created by the configure script")
 
-    @property
+    @cached_property
     def _configure_successful_path(self) -> Path:
-        return Path(self.environment["BUILD_DIR"], ".configure_successful")
+        return Path(self.build_dir, ".configure_successful")
 
     def _implicit_dependencies(self):
         if self.build.component.clone:
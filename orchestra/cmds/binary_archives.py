@@ -4,9 +4,6 @@ from loguru import logger
 
 from . import SubCommandParser
 from .fix_binary_archives_symlinks import handle_fix_binary_archives_symlinks
-from ..actions.util import get_script_output
-from ..gitutils import is_root_of_git_repo
-from ..model.configuration import Configuration
 
 
 def install_subcommand(sub_argparser: SubCommandParser):
@@ -42,6 +39,10 @@ def install_subcommand(sub_argparser: SubCommandParser):
 
 
 def handle_clean(args):
+    # Imported here to keep CLI startup fast
+    from ..gitutils import is_root_of_git_repo
+    from ..model.configuration import Configuration
+
     config = Configuration(use_config_cache=args.config_cache)
     for name, path in config.binary_archives_local_paths.items():
         if is_root_of_git_repo(path):
@@ -69,6 +70,9 @@ def handle_clean(args):
 
 
 def handle_ls(args):
+    # Imported here to keep CLI startup fast
+    from ..model.configuration import Configuration
+
     config = Configuration(use_config_cache=args.config_cache)
     for name in config.binary_archives_remotes.keys():
         path = os.path.join(config.binary_archives_dir, name)
@@ -83,6 +87,8 @@ def find_unreferenced_archives(binary_archive_path):
     :return: a set of paths of the unreferenced files. The paths are relative to binary_archive_path.
     """
 
+    from ..actions.util import get_script_output
+
     all_tracked_files = set(get_script_output(f"git lfs ls-files -n", cwd=binary_archive_path).splitlines())
 
     files_still_linked = set()
@@ -4,7 +4,6 @@ from loguru import logger
 
 from . import SubCommandParser
 from .common import execution_options
-from ..model.configuration import Configuration
 
 
 def install_subcommand(sub_argparser: SubCommandParser):
@@ -19,6 +18,9 @@ def install_subcommand(sub_argparser: SubCommandParser):
 
 
 def handle_clean(args):
+    # Imported here to keep CLI startup fast
+    from ..model.configuration import Configuration
+
     config = Configuration(use_config_cache=args.config_cache)
 
     builds = []
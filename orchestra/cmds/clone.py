@@ -2,8 +2,6 @@ from loguru import logger
 
 from . import SubCommandParser
 from .common import execution_options
-from ..executor import Executor
-from ..model.configuration import Configuration
 
 
 def install_subcommand(sub_argparser: SubCommandParser):
@@ -18,6 +16,10 @@ def install_subcommand(sub_argparser: SubCommandParser):
 
 
 def handle_clone(args):
+    # Imported here to keep CLI startup fast
+    from ..executor import Executor
+    from ..model.configuration import Configuration
+
     config = Configuration(use_config_cache=args.config_cache)
 
     actions = set()
@@ -34,7 +36,7 @@ def handle_clone(args):
 
         actions.add(build.component.clone)
 
-    executor = Executor(actions, no_force=args.no_force, pretend=args.pretend)
+    executor = Executor(actions, no_force=args.no_force, pretend=args.pretend, threads=args.jobs)
     failed = executor.run()
     exitcode = 1 if failed else 0
     return exitcode
@@ -1,4 +1,5 @@
 import argparse
+import os
 
 LFS_RETRIES_DEFAULT = 3
 
@@ -22,6 +23,15 @@ execution_group.add_argument(
     help="Do not execute actions, only print what would be done",
 )
 
+execution_group.add_argument(
+    "--jobs",
+    "-j",
+    metavar="N",
+    type=int,
+    default=os.cpu_count(),
+    help="Run up to N independent actions in parallel. Defaults to the number of CPUs",
+)
+
 execution_group.add_argument(
     "--lfs-retries",
     metavar="N",
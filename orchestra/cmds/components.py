@@ -5,8 +5,6 @@ from urllib.parse import urlparse
 from loguru import logger
 
 from . import SubCommandParser
-from ..model.configuration import Configuration
-from ..model.install_metadata import load_metadata, is_installed
 
 
 def normalize_repository_url(url):
@@ -39,6 +37,10 @@ def install_subcommand(sub_argparser: SubCommandParser):
 
 
 def handle_components(args):
+    # Imported here to keep CLI startup fast
+    from ..model.configuration import Configuration
+    from ..model.install_metadata import is_installed
+
     config = Configuration(use_config_cache=args.config_cache)
 
     if args.component:
@@ -95,6 +97,8 @@ def handle_components(args):
 
 
 def print_json(components, config):
+    from ..model.install_metadata import load_metadata
+
     components_json = []
     for component in sorted(components, key=lambda c: c.name):
         component_name = component.name
@@ -141,6 +145,8 @@ def print_json(components, config):
 
 
 def print_human_readable(components, config, args):
+    from ..model.install_metadata import load_metadata
+
     for component in components:
         component_name = component.name
         metadata = load_metadata(component_name, config)
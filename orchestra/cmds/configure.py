@@ -2,9 +2,6 @@ from loguru import logger
 
 from . import SubCommandParser
 from .common import execution_options, build_options
-from ..executor import Executor
-from ..gitutils.lfs import assert_lfs_installed
-from ..model.configuration import Configuration
 
 
 def install_subcommand(sub_argparser: SubCommandParser):
@@ -20,6 +17,11 @@ def install_subcommand(sub_argparser: SubCommandParser):
 
 
 def handle_configure(args):
+    # Imported here to keep CLI startup fast
+    from ..executor import Executor
+    from ..gitutils.lfs import assert_lfs_installed
+    from ..model.configuration import Configuration
+
     config = Configuration(
         fallback_to_build=args.fallback_build,
         force_from_source=args.from_source,
@@ -41,7 +43,13 @@ def handle_configure(args):
 
         actions.add(build.configure)
 
-    executor = Executor(actions, no_deps=args.no_deps, no_force=args.no_force, pretend=args.pretend)
+    executor = Executor(
+        actions,
+        no_deps=args.no_deps,
+        no_force=args.no_force,
+        pretend=args.pretend,
+        threads=args.jobs,
+    )
 
     failed = executor.run()
     exitcode = 1 if failed else 0
@@ -1,7 +1,6 @@
 from loguru import logger
 
 from . import SubCommandParser
-from ..model.configuration import Configuration
 from ..util import export_environment
 
 
@@ -11,6 +10,9 @@ def install_subcommand(sub_argparser: SubCommandParser):
 
 
 def handle_environment(args):
+    # Imported here to keep CLI startup fast
+    from ..model.configuration import Configuration
+
     config = Configuration(use_config_cache=args.config_cache)
 
     if not args.component:
@@ -1,5 +1,4 @@
 from . import SubCommandParser
-from ..model.configuration import Configuration
 
 from loguru import logger
 
@@ -13,6 +12,9 @@ def install_subcommand(sub_argparser: SubCommandParser):
 
 
 def handle_fix_binary_archives_symlinks(args):
+    # Imported here to keep CLI startup fast
+    from ..model.configuration import Configuration
+
     config = Configuration(use_config_cache=args.config_cache)
 
     for _, component in config.components.items():
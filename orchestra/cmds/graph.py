@@ -1,10 +1,7 @@
-import networkx as nx
 from loguru import logger
 
 from . import SubCommandParser
 from .common import build_options
-from ..executor import Executor
-from ..model.configuration import Configuration
 
 
 def install_subcommand(sub_argparser: SubCommandParser):
@@ -50,6 +47,12 @@ def install_subcommand(sub_argparser: SubCommandParser):
 
 
 def handle_graph(args):
+    # Imported here to keep CLI startup fast
+    import networkx as nx
+
+    from ..executor import Executor
+    from ..model.configuration import Configuration
+
     config = Configuration(
         fallback_to_build=args.fallback_build,
         force_from_source=args.from_source,
@@ -3,8 +3,6 @@ import os
 from loguru import logger
 
 from . import SubCommandParser
-from ..model.configuration import Configuration
-from ..model.install_metadata import load_file_list, is_installed
 
 
 def install_subcommand(sub_argparser: SubCommandParser):
@@ -51,6 +49,10 @@ def install_component_subcommand(sub_argparser: SubCommandParser):
 
 
 def handle_installed_files(args):
+    # Imported here to keep CLI startup fast
+    from ..model.configuration import Configuration
+    from ..model.install_metadata import load_file_list, is_installed
+
     config = Configuration(use_config_cache=args.config_cache)
     build = config.get_build(args.component)
 
@@ -71,6 +73,9 @@ def handle_installed_files(args):
 
 
 def handle_hash_material(args):
+    # Imported here to keep CLI startup fast
+    from ..model.configuration import Configuration
+
     config = Configuration(use_config_cache=args.config_cache)
     build = config.get_build(args.component)
 
@@ -85,6 +90,9 @@ def handle_hash_material(args):
 
 
 def handle_config(args):
+    # Imported here to keep CLI startup fast
+    from ..model.configuration import Configuration
+
     config = Configuration(use_config_cache=args.config_cache)
     with open(os.path.join(config.cache_dir, "config_cache.yml")) as f:
         print(f.read())
@@ -2,9 +2,6 @@ from loguru import logger
 
 from . import SubCommandParser
 from .common import build_options, execution_options
-from ..executor import Executor
-from ..gitutils.lfs import assert_lfs_installed
-from ..model.configuration import Configuration
 
 
 def install_subcommand(sub_argparser: SubCommandParser):
@@ -27,6 +24,11 @@ def install_subcommand(sub_argparser: SubCommandParser):
 
 
 def handle_install(args):
+    # Imported here to keep CLI startup fast
+    from ..executor import Executor
+    from ..gitutils.lfs import assert_lfs_installed
+    from ..model.configuration import Configuration
+
     config = Configuration(
         fallback_to_build=args.fallback_build,
         force_from_source=args.from_source,
@@ -49,7 +51,13 @@ def handle_install(args):
             return 1
         actions.add(build.install)
 
-    executor = Executor(actions, no_deps=args.no_deps, no_force=args.no_force, pretend=args.pretend)
+    executor = Executor(
+        actions,
+        no_deps=args.no_deps,
+        no_force=args.no_force,
+        pretend=args.pretend,
+        threads=args.jobs,
+    )
     failed = executor.run()
     exitcode = 1 if failed else 0
     return exitcode
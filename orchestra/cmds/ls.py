@@ -3,7 +3,6 @@ import os
 from loguru import logger
 
 from . import SubCommandParser
-from ..model.configuration import Configuration
 
 
 def install_subcommand(sub_argparser: SubCommandParser):
@@ -21,6 +20,9 @@ def install_subcommand(sub_argparser: SubCommandParser):
 
 
 def handle_ls(args):
+    # Imported here to keep CLI startup fast
+    from ..model.configuration import Configuration
+
     config = Configuration(use_config_cache=args.config_cache)
 
     if args.git_sources + args.binary_archives != 1:
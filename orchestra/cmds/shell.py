@@ -1,14 +1,12 @@
 import argparse
 import os
+import pwd
 import shlex
 from textwrap import dedent
 
 from loguru import logger
 
 from . import SubCommandParser
-from ..actions.util import get_script_output
-from ..actions.util.impl import _run_script
-from ..model.configuration import Configuration
 
 
 def install_subcommand(sub_argparser: SubCommandParser):
@@ -28,6 +26,10 @@ def install_subcommand(sub_argparser: SubCommandParser):
 
 
 def handle_shell(args):
+    # Imported here to keep CLI startup fast
+    from ..actions.util.impl import _run_script
+    from ..model.configuration import Configuration
+
     config = Configuration(use_config_cache=args.config_cache)
     command = args.command
 
@@ -44,8 +46,9 @@ def handle_shell(args):
 
         env = build.install.environment
         ps1_prefix = f"(orchestra - {build.qualified_name}) "
-        if os.path.exists(build.install.environment["BUILD_DIR"]):
-            cd_to = build.install.environment["BUILD_DIR"]
+        build_dir = env["BUILD_DIR"]
+        if os.path.isdir(build_dir):
+            cd_to = build_dir
         else:
             cd_to = os.getcwd()
 
@@ -60,7 +63,7 @@ def handle_shell(args):
         )
         return p.returncode
 
-    user_shell = get_script_output("getent passwd $(whoami) | cut -d: -f7").strip()
+    user_shell = pwd.getpwuid(os.getuid()).pw_shell or "/bin/sh"
 
     env["OLD_HOME"] = os.environ["HOME"]
     env["HOME"] = os.path.join(os.path.dirname(__file__), "..", "support", "shell-home")
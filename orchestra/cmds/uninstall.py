@@ -1,9 +1,6 @@
 from loguru import logger
 
 from . import SubCommandParser
-from ..actions.install import uninstall
-from ..model.configuration import Configuration
-from ..model.install_metadata import is_installed
 from ..util import parse_component_name
 
 
@@ -13,6 +10,11 @@ def install_subcommand(sub_argparser: SubCommandParser):
 
 
 def handle_uninstall(args):
+    # Imported here to keep CLI startup fast
+    from ..actions.install import uninstall
+    from ..model.configuration import Configuration
+    from ..model.install_metadata import is_installed
+
     config = Configuration(use_config_cache=args.config_cache)
 
     component_names_to_uninstall = set()
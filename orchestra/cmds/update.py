@@ -1,24 +1,26 @@
 import os.path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from textwrap import dedent
 
 from loguru import logger
 from tqdm import tqdm
 
 from . import SubCommandParser
-from ..actions.util import run_internal_subprocess, try_run_internal_subprocess
 from ..exceptions import UserException
-from ..gitutils import is_root_of_git_repo
-from ..gitutils.lfs import assert_lfs_installed
-from ..model.configuration import Configuration
 
 
 def install_subcommand(sub_argparser: SubCommandParser):
     cmd_parser = sub_argparser.add_subcmd("update", handler=handle_update, help="Update components")
     cmd_parser.add_argument("--no-config", action="store_true", help="Don't pull orchestra config")
-    cmd_parser.add_argument("--parallelism", type=int, default=1, help="Maximum parallel processes")
+    cmd_parser.add_argument("--parallelism", type=int, default=16, help="Maximum parallel processes")
 
 
 def handle_update(args):
+    # Imported here to keep CLI startup fast
+    from ..gitutils import is_root_of_git_repo
+    from ..gitutils.lfs import assert_lfs_installed
+    from ..model.configuration import Configuration
+
     config = Configuration(use_config_cache=args.config_cache)
     failed_pulls = []
     failed_clones = []
@@ -32,18 +34,34 @@ def handle_update(args):
 
     logger.info("Updating binary archives")
     os.makedirs(config.binary_archives_dir, exist_ok=True)
-    progress_bar = tqdm(config.binary_archives_remotes.items(), unit="archives")
-    for name, url in progress_bar:
+
+    def update_binary_archive(name, url):
+        """Pulls or clones a binary archive. Returns None on success, a failure description otherwise."""
         binary_archive_path = os.path.join(config.binary_archives_dir, name)
-        progress_bar.set_postfix_str(f"{name}")
         if os.path.exists(binary_archive_path):
             logger.debug(f"Pulling binary archive {name}")
             if not pull_binary_archive(name, config):
-                failed_pulls.append(f"Binary archive {name} ({os.path.join(config.binary_archives_dir, name)})")
+                return failed_pulls, f"Binary archive {name} ({binary_archive_path})"
         else:
             logger.info(f"Trying to clone binary archive from remote {name} ({url})")
             if not clone_binary_archive(name, url, config):
-                failed_clones.append(f"Binary archive {name} ({url})!")
+                return failed_clones, f"Binary archive {name} ({url})!"
+        return None
+
+    # Pulls are network-bound, so running them concurrently makes the total
+    # wall time closer to the slowest pull rather than the sum of all of them
+    with ThreadPoolExecutor(max_workers=max(1, args.parallelism)) as executor:
+        pending = {
+            executor.submit(update_binary_archive, name, url): name
+            for name, url in config.binary_archives_remotes.items()
+        }
+        progress_bar = tqdm(as_completed(pending), total=len(pending), unit="archives")
+        for future in progress_bar:
+            progress_bar.set_postfix_str(f"{pending[future]}")
+            failure = future.result()
+            if failure is not None:
+                failure_list, message = failure
+                failure_list.append(message)
 
     logger.info("Resetting ls-remote cached info")
     ls_remote_cache = os.path.join(config.cache_dir, "remote_refs_cache.json")
@@ -53,31 +71,45 @@ def handle_update(args):
     logger.info("Updating ls-remote cached info")
     failed_ls_remotes = config.remote_heads_cache.rebuild_cache(parallelism=args.parallelism)
 
+    # List the source directories once instead of stat-ing one path per component
+    try:
+        with os.scandir(config.sources_dir) as entries:
+            existing_sources = {entry.name for entry in entries}
+    except FileNotFoundError:
+        existing_sources = set()
+
     to_pull = []
     for _, component in config.components.items():
         if not component.clone:
             continue
 
-        source_path = os.path.join(config.sources_dir, component.name)
-        if not os.path.exists(source_path):
+        if component.name not in existing_sources:
             continue
 
         to_pull.append(component)
 
-    if to_pull:
-        logger.info("Updating repositories")
-        progress_bar = tqdm(to_pull, unit="components")
-        for component in progress_bar:
-            source_path = os.path.join(config.sources_dir, component.name)
-            logger.debug(f"Pulling {component.name}")
-            progress_bar.set_postfix_str(f"{component.name}")
+    def update_repository(component):
+        """Pulls a component repository. Returns None on success, a failure description otherwise."""
+        source_path = os.path.join(config.sources_dir, component.name)
+        logger.debug(f"Pulling {component.name}")
+
+        if not is_root_of_git_repo(source_path):
+            return f"Repository {component.name}: Directory {source_path} is not a git repo"
 
-            if not is_root_of_git_repo(source_path):
-                failed_pulls.append(f"Repository {component.name}: Directory {source_path} is not a git repo")
-                continue
+        if not git_pull(source_path):
+            return f"Repository {component.name}"
+        return None
 
-            if not git_pull(source_path):
-                failed_pulls.append(f"Repository {component.name}")
+    if to_pull:
+        logger.info("Updating repositories")
+        with ThreadPoolExecutor(max_workers=max(1, args.parallelism)) as executor:
+            pending = {executor.submit(update_repository, component): component for component in to_pull}
+            progress_bar = tqdm(as_completed(pending), total=len(pending), unit="components")
+            for future in progress_bar:
+                progress_bar.set_postfix_str(f"{pending[future].name}")
+                failure = future.result()
+                if failure is not None:
+                    failed_pulls.append(failure)
 
     if failed_pulls:
         formatted_failed_pulls = "\n".join([f"  - {repo}" for repo in failed_pulls])
@@ -137,6 +169,8 @@ def handle_update(args):
 
 def clone_binary_archive(name, url, config):
     """Clones a binary archive. Returns a boolean value representing the operation success."""
+    from ..actions.util import try_run_internal_subprocess
+
     binary_archive_path = os.path.join(config.binary_archives_dir, name)
     env = os.environ.copy()
     env["GIT_SSH_COMMAND"] = "ssh -oControlPath=~/.ssh/ssh-mux-%r@%h:%p -oControlMaster=auto -o ControlPersist=10"
@@ -149,6 +183,8 @@ def clone_binary_archive(name, url, config):
 
 
 def pull_binary_archive(name, config):
+    from ..gitutils import is_root_of_git_repo
+
     binary_archive_path = os.path.join(config.binary_archives_dir, name)
     # This check is to ensure we are called with the path of an existing binary archive
     # and don't clean/reset orchestra configuration
@@ -162,10 +198,14 @@ def pull_binary_archive(name, config):
 
 
 def git_clean(directory):
+    from ..actions.util import run_internal_subprocess
+
     return run_internal_subprocess(["git", "clean", "-d", "--force"], cwd=directory)
 
 
 def git_reset_hard(directory, ref="master"):
+    from ..actions.util import run_internal_subprocess
+
     env = os.environ.copy()
     env["GIT_LFS_SKIP_SMUDGE"] = "1"
     return run_internal_subprocess(["git", "reset", "--hard", ref], cwd=directory, environment=env)
@@ -174,7 +214,11 @@ def git_reset_hard(directory, ref="master"):
 def git_pull(directory):
     """Runs git pull --ff-only on the given directory.
     Returns a boolean value representing the operation success."""
+    from ..actions.util import try_run_internal_subprocess
+
     env = os.environ.copy()
+    # Reuse a single SSH connection across the parallel pulls instead of paying one handshake per repository
+    env["GIT_SSH_COMMAND"] = "ssh -oControlPath=~/.ssh/ssh-mux-%r@%h:%p -oControlMaster=auto -o ControlPersist=10"
     env["GIT_LFS_SKIP_SMUDGE"] = "1"
     returncode = try_run_internal_subprocess(["git", "pull", "--ff-only"], environment=env, cwd=directory)
     return returncode == 0
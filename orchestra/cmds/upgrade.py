@@ -1,8 +1,5 @@
 from . import SubCommandParser
 from .common import execution_options, build_options
-from ..executor import Executor
-from ..model.configuration import Configuration
-from ..model.install_metadata import load_metadata
 
 
 def install_subcommand(sub_argparser: SubCommandParser):
@@ -15,6 +12,11 @@ def install_subcommand(sub_argparser: SubCommandParser):
 
 
 def handle_upgrade(args):
+    # Imported here to keep CLI startup fast
+    from ..executor import Executor
+    from ..model.configuration import Configuration
+    from ..model.install_metadata import load_metadata
+
     config = Configuration(
         fallback_to_build=args.fallback_build,
         force_from_source=args.from_source,
@@ -35,7 +37,7 @@ def handle_upgrade(args):
 
     args.keep_tmproot = False
     args.no_merge = False
-    executor = Executor(install_actions, no_force=True, pretend=args.pretend)
+    executor = Executor(install_actions, no_force=True, pretend=args.pretend, threads=args.jobs)
     failed = executor.run()
     exitcode = 1 if failed else 0
     return exitcode
@@ -9,7 +9,6 @@ from typing import Optional
 from loguru import logger
 
 import orchestra.globals
-import orchestra.actions.util
 
 
 class OrchestraException(Exception, ABC):
@@ -203,6 +202,9 @@ class BinaryArchiveNotFoundException(UserException):
         self.action = action
 
     def log_error(self):
+        # Imported here to avoid a circular import with orchestra.actions
+        import orchestra.actions.util
+
         diffs = {}
         with NamedTemporaryFile("w", prefix="current_hash_material_") as f:
             f.write(self.action.build.component.recursive_hash_material())
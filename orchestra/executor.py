@@ -1,12 +1,14 @@
 import graphlib
+import heapq
 import os
+import queue
 import signal
 import sys
 import threading
 import time
 from collections import defaultdict
 from concurrent import futures
-from itertools import permutations, product
+from itertools import count, permutations, product
 from typing import List, Dict
 
 import networkx as nx
@@ -24,26 +26,41 @@ DUMMY_ROOT = "Dummy root"
 class Executor:
     def __init__(self, actions, no_deps=False, no_force=False, pretend=False, threads=1):
         self.actions = actions
+        self._explicit_actions = frozenset(actions)
         self.no_deps = no_deps
         self.no_force = no_force
         self.pretend = pretend
-        self.threads = 1
+        self.threads = max(1, threads)
 
         self._toposorter = graphlib.TopologicalSorter()
-        self._pool = futures.ThreadPoolExecutor(max_workers=threads, thread_name_prefix="Builder")
+        self._pool = futures.ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="Builder")
         self._queued_actions: Dict[futures.Future, Action] = {}
+        self._completed_futures: "queue.SimpleQueue[futures.Future]" = queue.SimpleQueue()
         self._running_actions: List[Action] = []
         self._failed_actions: List[Action] = []
         self._stop_the_world = False
 
         self._total_remaining = None
         self._current_remaining = None
+        self._priorities: Dict[Action, int] = {}
+
+        # Memoizes Action.is_satisfied for the duration of the run: solving the
+        # dependency graph probes the same actions many times and is_satisfied
+        # can hit the filesystem
+        self._satisfied_cache: Dict[Action, bool] = {}
+
+        # Memoizes Action.dependencies, which builds a new set on every access
+        self._deps_cache: Dict[Action, tuple] = {}
 
     def run(self):
         dependency_graph = self._create_dependency_graph()
 
         self._verify_prerequisites(dependency_graph)
 
+        # Actions with many transitive dependents are scheduled first: running
+        # them early keeps the pool from idling behind a high-fan-out action
+        self._priorities = {action: len(nx.ancestors(dependency_graph, action)) for action in dependency_graph.nodes}
+
         self._init_toposorter(dependency_graph)
 
         try:
@@ -53,6 +70,7 @@ class Executor:
 
         if not self._toposorter.is_active():
             logger.info("No actions to perform")
+            return []
 
         self._total_remaining = dependency_graph.number_of_nodes()
         self._current_remaining = self._total_remaining
@@ -61,20 +79,34 @@ class Executor:
 
         self._stop_the_world = False
 
+        set_terminal_title(f"orchestra: 0/{self._total_remaining}")
+
         # Schedule and run the actions
         while (self._toposorter.is_active() and not self._failed_actions) or self._queued_actions:
-            for action in self._toposorter.get_ready():
+            for action in sorted(self._toposorter.get_ready(), key=self._priorities.get, reverse=True):
                 future = self._pool.submit(self._run_action, action)
                 self._queued_actions[future] = action
+                # Completed (or cancelled) futures are delivered through a queue,
+                # which is O(1) regardless of how many actions are in flight
+                future.add_done_callback(self._completed_futures.put)
 
+            if not self._queued_actions:
+                continue
+
+            # Block until at least one action completes, then drain any
+            # other completions that arrived in the meantime
             try:
-                done, not_done = futures.wait(self._queued_actions, return_when=futures.FIRST_COMPLETED)
+                done = [self._completed_futures.get()]
+                while True:
+                    try:
+                        done.append(self._completed_futures.get_nowait())
+                    except queue.Empty:
+                        break
             except KeyboardInterrupt:
                 os.killpg(os.getpgid(os.getpid()), signal.SIGINT)
 
             for completed_future in done:
-                action = self._queued_actions[completed_future]
-                del self._queued_actions[completed_future]
+                action = self._queued_actions.pop(completed_future)
                 try:
                     exception = completed_future.exception()
                 except futures.CancelledError:
@@ -90,8 +122,15 @@ class Executor:
                         logger.error(f"An unexpected exception occurred while running {action}")
                         logger.error(exception)
                 else:
+                    # An action that ran to completion is satisfied from now on
+                    self._satisfied_cache[action] = True
                     self._toposorter.done(action)
 
+            # Updating once per batch of completions keeps the terminal writes
+            # negligible even when many short actions finish in a burst
+            completed = self._total_remaining - self._current_remaining - len(self._running_actions)
+            set_terminal_title(f"orchestra: {completed}/{self._total_remaining}")
+
         assert len(self._queued_actions) == 0 and len(self._running_actions) == 0
 
         return list(self._failed_actions)
@@ -140,60 +179,127 @@ class Executor:
     def _create_initial_dependency_graph(self):
         graph = nx.DiGraph()
         graph.add_node(DUMMY_ROOT)
-        for action in self.actions:
-            graph.add_edge(DUMMY_ROOT, action)
-            self._collect_dependencies(action, graph)
+        graph.add_edges_from((DUMMY_ROOT, action) for action in self.actions)
+        self._collect_dependencies(self.actions, graph)
         return graph
 
-    def _collect_dependencies(self, action, graph, already_visited_nodes=None):
-        if already_visited_nodes is None:
-            already_visited_nodes = set()
-
-        if action in already_visited_nodes:
-            return
+    def _collect_dependencies(self, actions, graph):
+        # Iterative DFS: recursing one Python frame per dependency would risk
+        # hitting the interpreter recursion limit on deep dependency chains
+        stack = list(actions)
+        already_visited_nodes = set()
+        while stack:
+            current_action = stack.pop()
+            if current_action in already_visited_nodes:
+                continue
 
-        already_visited_nodes.add(action)
-        graph.add_node(action)
-        if self.no_deps:
-            return
+            already_visited_nodes.add(current_action)
+            graph.add_node(current_action)
+            if self.no_deps:
+                continue
 
-        for dependency in action.dependencies:
-            graph.add_edge(action, dependency)
-            self._collect_dependencies(dependency, graph, already_visited_nodes=already_visited_nodes)
+            dependencies = self._deps(current_action)
+            graph.add_edges_from((current_action, dependency) for dependency in dependencies)
+            stack.extend(dependencies)
 
     def _assign_choices(self, graph):
-        # We can assign the choices for each strongly connected component independently
-        while has_choices(graph):
-            strongly_connected_components = list(nx.algorithms.strongly_connected_components(graph))
-            strongly_connected_components.sort(key=len, reverse=True)
-            for strongly_connected_component in strongly_connected_components:
-                any_of_nodes = [
-                    c
-                    for c in strongly_connected_component
-                    if isinstance(c, AnyOfAction) and len(list(graph.successors(c))) > 1
-                ]
-                if not any_of_nodes:
-                    # There are no InstallAny nodes in this SCC, don't waste time
-                    continue
-                graph = self._assign_strongly_connected_component(graph, any_of_nodes, strongly_connected_component)
-                if graph is None:
-                    return graph
+        # We can assign the choices for each strongly connected component independently.
+        # The unassigned choices are tracked in a set so each round only looks at
+        # them instead of rescanning every node of the graph
+        pending_choices = {
+            node for node in graph.nodes if isinstance(node, AnyOfAction) and graph.out_degree(node) > 1
+        }
+        if not pending_choices:
+            return graph
+
+        # Assigning a choice only removes successor edges of nodes inside its
+        # SCC, which cannot alter the decomposition of the rest of the graph.
+        # The SCCs are therefore computed once, kept in a largest-first heap,
+        # and only the SCCs touched by an assignment are decomposed again.
+        scc_heap = []
+        tie_breaker = count()
+
+        def push_components_with_choices(components):
+            for scc in components:
+                if any(node in pending_choices for node in scc):
+                    heapq.heappush(scc_heap, (-len(scc), next(tie_breaker), scc))
+
+        push_components_with_choices(nx.algorithms.strongly_connected_components(graph))
+
+        while scc_heap:
+            components_with_choices = []
+            while scc_heap:
+                _, _, strongly_connected_component = heapq.heappop(scc_heap)
+                any_of_nodes = [c for c in strongly_connected_component if c in pending_choices]
+                if any_of_nodes:
+                    components_with_choices.append((strongly_connected_component, any_of_nodes))
+
+            if not components_with_choices:
                 break
 
+            if self.threads > 1 and len(components_with_choices) > 1:
+                graph = self._assign_components_in_parallel(graph, components_with_choices)
+                touched = components_with_choices
+            else:
+                strongly_connected_component, any_of_nodes = components_with_choices[0]
+                graph = self._assign_strongly_connected_component(graph, any_of_nodes, strongly_connected_component)
+                touched = components_with_choices[:1]
+                # The remaining SCCs were not touched, put them back as they are
+                for untouched, _ in components_with_choices[1:]:
+                    heapq.heappush(scc_heap, (-len(untouched), next(tie_breaker), untouched))
+            if graph is None:
+                return graph
+
+            pending_choices = {node for node in pending_choices if graph.out_degree(node) > 1}
+            for touched_component, _ in touched:
+                push_components_with_choices(
+                    nx.algorithms.strongly_connected_components(graph.subgraph(touched_component))
+                )
+
         return graph
 
-    def _assign_strongly_connected_component(self, graph, remaining, strongly_connected_component):
-        # TODO: the copy() operation ~halves performance. The other edge/node add/removal
-        #       operations have an impact as well. We can avoid them using filtered views.
+    def _assign_components_in_parallel(self, graph, components_with_choices):
+        """Solves each strongly connected component on its own copy of the graph
+        through the worker pool, then mirrors the assignments on the parent graph.
+
+        Merging only ever removes the non-chosen alternatives of a solved choice,
+        and removing edges cannot introduce cycles, so the merged graph is
+        acyclic wherever the per-component solutions were.
+        """
+
+        def solve(component_with_choices):
+            strongly_connected_component, any_of_nodes = component_with_choices
+            return self._assign_strongly_connected_component(
+                graph.copy(), list(any_of_nodes), strongly_connected_component
+            )
+
+        solved_copies = list(self._pool.map(solve, components_with_choices))
+
+        for solved_copy, (_, any_of_nodes) in zip(solved_copies, components_with_choices):
+            if solved_copy is None:
+                return None
+
+            for choice in any_of_nodes:
+                # Choices left with multiple alternatives were unreachable in the
+                # copy; they stay pending and are assigned in a later round
+                if solved_copy.out_degree(choice) != 1 or graph.out_degree(choice) == 1:
+                    continue
+                chosen = next(iter(solved_copy.successors(choice)))
+                not_chosen = [alternative for alternative in graph.successors(choice) if alternative is not chosen]
+                graph.remove_edges_from((choice, alternative) for alternative in not_chosen)
+
+        return graph
 
+    def _assign_strongly_connected_component(self, graph, remaining, strongly_connected_component):
         # No more choices remain, check if the subgraph
         # of the stringly connected components is cyclic
         if not remaining:
-            subgraph = graph.copy()
-            self._remove_unreachable_actions(subgraph, [DUMMY_ROOT])
-            subgraph = subgraph.subgraph(strongly_connected_component)
+            # A filtered view over the reachable part of the SCC avoids
+            # copying the whole graph just to run the cycle check
+            visible_nodes = reachable_nodes(graph, [DUMMY_ROOT]).intersection(strongly_connected_component)
+            subgraph = nx.subgraph_view(graph, filter_node=nxfilters.show_nodes(visible_nodes))
 
-            if has_unsatisfied_cycles(subgraph):
+            if has_unsatisfied_cycles(subgraph, self._is_satisfied):
                 return None
             else:
                 return graph
@@ -202,7 +308,7 @@ class Executor:
 
         # Try all choices
         alternatives = list(graph.successors(to_assign))
-        alternatives.sort(key=keyer(to_assign))
+        alternatives.sort(key=keyer(to_assign, self._is_satisfied))
 
         graph.remove_edges_from((to_assign, s) for s in alternatives)
 
@@ -230,33 +336,42 @@ class Executor:
     def _simplify_anyof_actions(graph):
         for action in list(graph.nodes):
             if isinstance(action, AnyOfAction):
+                assert graph.out_degree(action) == 1, f"Choice {action} was not taken?"
                 predecessors = list(graph.predecessors(action))
-                successors = list(graph.successors(action))
-                assert len(successors) == 1, f"Choice {action} was not taken?"
+                successor = next(iter(graph.successors(action)))
                 graph.remove_node(action)
-                graph.add_edges_from((p, successors[0]) for p in predecessors)
+                graph.add_edges_from((p, successor) for p in predecessors)
 
     @staticmethod
     def _remove_unreachable_actions(graph, roots):
         # Remove all nodes that are not reachable from one of the roots
-        shortest_paths = nx.multi_source_dijkstra_path_length(graph, roots)
-        for node in list(graph.nodes):
-            if node not in shortest_paths:
-                graph.remove_node(node)
-
-    @staticmethod
-    def _remove_satisfied_attracting_components(graph):
-        # Remove sets of attracting components where all components are satisfied
-        fixed_point_reached = False
+        graph.remove_nodes_from(set(graph) - reachable_nodes(graph, roots))
+
+    def _remove_satisfied_attracting_components(self, graph):
+        # Remove sets of attracting components where all components are satisfied.
+        # An attracting component is a sink of the condensation, and removing one
+        # can only turn its predecessors into new sinks, so a worklist over the
+        # condensation reaches the fixed point in a single linear sweep instead
+        # of recomputing every attracting component after each removal
+        condensation = nx.condensation(graph)
+        members = nx.get_node_attributes(condensation, "members")
+        out_degree = dict(condensation.out_degree())
+        worklist = [node for node, degree in out_degree.items() if degree == 0]
         done_something = False
-        while not fixed_point_reached:
-            fixed_point_reached = True
-            for attracting_components in nx.attracting_components(graph):
-                if all(c.is_satisfied() for c in attracting_components):
-                    graph.remove_nodes_from(attracting_components)
-                    fixed_point_reached = False
-                    done_something = True
-                    break
+        while worklist:
+            sink = worklist.pop()
+            if not all(self._is_satisfied(c) for c in members[sink]):
+                continue
+
+            predecessors = list(condensation.predecessors(sink))
+            graph.remove_nodes_from(members[sink])
+            condensation.remove_node(sink)
+            done_something = True
+
+            for predecessor in predecessors:
+                out_degree[predecessor] -= 1
+                if out_degree[predecessor] == 0:
+                    worklist.append(predecessor)
         return done_something
 
     def _enforce_intra_component_ordering(self, dependency_graph):
@@ -305,12 +420,18 @@ class Executor:
         scheduled_builds_per_component = defaultdict(set)
         scheduled_actions_per_direct_build_dependency = defaultdict(set)
 
-        for action in dependency_graph.nodes:
-            if isinstance(action, ActionForBuild):
-                scheduled_builds_per_component[action.component].add(action.build)
-                scheduled_actions_per_build[action.build].add(action)
-                for d in dependency_graph.predecessors(action):
-                    scheduled_actions_per_direct_build_dependency[action.build].add(d)
+        actions_for_build = [action for action in dependency_graph.nodes if isinstance(action, ActionForBuild)]
+        # Resolves the isinstance check and the build attribute once, as
+        # _try_group_orders probes both for every pair of actions
+        builds_by_action = {action: action.build for action in actions_for_build}
+        for action in actions_for_build:
+            scheduled_builds_per_component[action.component].add(action.build)
+            scheduled_actions_per_build[action.build].add(action)
+
+        # A single batched pass over the incoming edges avoids creating one
+        # predecessors generator per node
+        for d, action in dependency_graph.in_edges(actions_for_build):
+            scheduled_actions_per_direct_build_dependency[action.build].add(d)
 
         groups_by_component = defaultdict(list)
         for c, blds in scheduled_builds_per_component.items():
@@ -322,7 +443,7 @@ class Executor:
                 groups_by_component[c].append(group)
 
         for component, group in groups_by_component.items():
-            dependency_graph = self._try_group_orders(dependency_graph, group)
+            dependency_graph = self._try_group_orders(dependency_graph, group, builds_by_action)
             if dependency_graph is None:
                 raise UserException(
                     f"Could not enforce an order between actions of "
@@ -331,19 +452,53 @@ class Executor:
 
         return dependency_graph
 
-    @staticmethod
-    def _try_group_orders(dependency_graph, group):
-        for permutation in permutations(group):
-            # TODO: duplicating the graph is not good for performance, might be worth removing nodes manually
-            depgraph_copy = dependency_graph.copy()
+    def _try_group_orders(self, dependency_graph, group, builds_by_action):
+        # An existing path from group A to group B means B cannot be ordered
+        # before A without closing a new cycle, so permutations respecting the
+        # existing paths are attempted first. The inconsistent ones are kept as
+        # a fallback because they can still be accepted when the cycles they
+        # close only go through satisfied actions.
+        group_reachable_nodes = []
+        for g in group:
+            reachable = set()
+            for action in g:
+                reachable.update(nx.descendants(dependency_graph, action))
+            group_reachable_nodes.append(reachable)
+
+        must_precede = nx.DiGraph()
+        must_precede.add_nodes_from(range(len(group)))
+        must_precede.add_edges_from(
+            (i, j)
+            for i in range(len(group))
+            for j in range(len(group))
+            if i != j and group_reachable_nodes[i] & group[j]
+        )
+
+        def candidate_orders():
+            # The orders consistent with the existing paths are exactly the
+            # linear extensions of the must-precede graph, typically just one
+            attempted = set()
+            if nx.is_directed_acyclic_graph(must_precede):
+                for order in nx.all_topological_sorts(must_precede):
+                    order = tuple(order)
+                    attempted.add(order)
+                    yield order
+            for order in permutations(range(len(group))):
+                if order not in attempted:
+                    yield order
+
+        for order in candidate_orders():
+            permutation = [group[group_index] for group_index in order]
+            # Instead of copying the whole graph per permutation, add the
+            # ordering edges in place and roll them back if the order is rejected
+            added_edges = []
 
             for g1, g2 in zip(permutation, permutation[1:]):
                 # Add edge from all nodes in g1 to all nodes in g2
                 for a1, a2 in product(g1, g2):
                     same_action = a1 is a2
-                    same_build = (
-                        isinstance(a1, ActionForBuild) and isinstance(a2, ActionForBuild) and a1.build is a2.build
-                    )
+                    build1 = builds_by_action.get(a1)
+                    same_build = build1 is not None and build1 is builds_by_action.get(a2)
 
                     # Don't add self loops or edges between actions for the same build.
                     # Self loops add an unbreakable cycle that we obviously don't want.
@@ -353,10 +508,17 @@ class Executor:
                     if same_action or same_build:
                         continue
 
-                    depgraph_copy.add_edge(a1, a2, label="Intra-component ordering")
+                    # Pre-existing edges must not end up in the undo log
+                    if dependency_graph.has_edge(a1, a2):
+                        continue
+
+                    dependency_graph.add_edge(a1, a2, label="Intra-component ordering")
+                    added_edges.append((a1, a2))
 
-            if not has_unsatisfied_cycles(depgraph_copy):
-                return depgraph_copy
+            if not has_unsatisfied_cycles(dependency_graph, self._is_satisfied):
+                return dependency_graph
+
+            dependency_graph.remove_edges_from(added_edges)
 
     @staticmethod
     def _transitive_reduction(graph):
@@ -376,39 +538,59 @@ class Executor:
         #  - expand the condensed graph back to it's expanded form
         condensed_graph = nx.algorithms.condensation(graph)
         mapping = condensed_graph.graph["mapping"]
-        members = nx.get_node_attributes(condensed_graph, "members")
 
         condensed_graph = nx.algorithms.transitive_reduction(condensed_graph)
 
-        # TODO: review this code, it may be re-adding edges that were taken out by the transitive reduction
+        # Inflate the reduced condensation back in a single pass over the
+        # original edges: an edge survives if it is internal to a strongly
+        # connected component or connects two components the reduction kept
         inflated_graph = nx.DiGraph()
-        for condensed_node in condensed_graph.nodes:
-            condensed_node_members = members[condensed_node]
-            subgraph = nx.subgraph_view(graph, filter_node=nxfilters.show_nodes(condensed_node_members))
-            inflated_graph = nx.union(inflated_graph, subgraph)
-
-            for u, v in graph.out_edges(condensed_node_members):
-                v_condensed_node = mapping[v]
-                if condensed_graph.has_edge(condensed_node, v_condensed_node):
-                    inflated_graph.add_edge(u, v)
+        inflated_graph.add_nodes_from(graph.nodes(data=True))
+        reduced_condensed_edges = set(condensed_graph.edges)
+        for u, v in graph.edges:
+            u_condensed_node = mapping[u]
+            v_condensed_node = mapping[v]
+            if u_condensed_node == v_condensed_node or (u_condensed_node, v_condensed_node) in reduced_condensed_edges:
+                inflated_graph.add_edge(u, v)
 
         nx.set_edge_attributes(inflated_graph, labels, "label")
         return inflated_graph
 
-    @staticmethod
-    def _verify_prerequisites(dependency_graph):
-        for action in dependency_graph.nodes:
-            action.assert_prerequisites_are_met()
+    def _verify_prerequisites(self, dependency_graph):
+        # The checks are independent and mostly filesystem-bound, so spread
+        # them over the pool when more than one thread is available.
+        # Consuming the map iterator propagates the first failure, keeping the
+        # raise-on-unmet-prerequisite semantics
+        if self.threads > 1:
+            list(self._pool.map(lambda action: action.assert_prerequisites_are_met(), dependency_graph.nodes))
+        else:
+            for action in dependency_graph.nodes:
+                action.assert_prerequisites_are_met()
 
     def _init_toposorter(self, dependency_graph):
-        for action in dependency_graph.nodes:
-            dependencies = dependency_graph.successors(action)
+        # Iterating the adjacency mapping yields each node with its successors
+        # in one pass, without creating a successors generator per node
+        for action, dependencies in dependency_graph.adj.items():
             self._toposorter.add(action, *dependencies)
 
+    def _deps(self, action):
+        dependencies = self._deps_cache.get(action)
+        if dependencies is None:
+            dependencies = tuple(action.dependencies)
+            self._deps_cache[action] = dependencies
+        return dependencies
+
+    def _is_satisfied(self, action):
+        satisfied = self._satisfied_cache.get(action)
+        if satisfied is None:
+            satisfied = action.is_satisfied()
+            self._satisfied_cache[action] = satisfied
+        return satisfied
+
     def _run_action(self, action: Action):
         self._running_actions.append(action)
         self._current_remaining -= 1
-        explicitly_requested = action in self.actions
+        explicitly_requested = action in self._explicit_actions
 
         try:
             if self._stop_the_world:
@@ -425,22 +607,21 @@ class Executor:
         signal.default_int_handler(signal.SIGINT, frame)
 
 
-def has_unsatisfied_cycles(graph):
-    simple_cycles = list(nx.simple_cycles(graph))
-    for cycle in simple_cycles:
-        if not all(c.is_satisfied() for c in cycle):
-            return True
-    return False
-
-
-def has_choices(graph):
-    for node in graph.nodes:
-        if isinstance(node, AnyOfAction) and len(list(graph.successors(node))) > 1:
+def has_unsatisfied_cycles(graph, is_satisfied):
+    # Every node of a non-trivial strongly connected component lies on a cycle,
+    # so checking SCCs is equivalent to enumerating all simple cycles
+    # (exponential in the worst case) while staying linear in the graph size
+    for strongly_connected_component in nx.strongly_connected_components(graph):
+        if len(strongly_connected_component) == 1:
+            (node,) = strongly_connected_component
+            if not graph.has_edge(node, node):
+                continue
+        if not all(is_satisfied(c) for c in strongly_connected_component):
             return True
     return False
 
 
-def keyer(to_assign):
+def keyer(to_assign, is_satisfied):
     def _keyer(action):
         """
         Prioritize choices in this order:
@@ -448,7 +629,7 @@ def keyer(to_assign):
          - preferred build (either explicitly specified or default)
          - all others in alphabetical order
         """
-        if action.is_satisfied():
+        if is_satisfied(action):
             priority = 0
         elif action is to_assign.preferred_action:
             priority = 1
@@ -459,12 +640,25 @@ def keyer(to_assign):
     return _keyer
 
 
+def reachable_nodes(graph, roots):
+    """Returns the set of nodes reachable from any of the roots"""
+    reachable = set()
+    stack = list(roots)
+    while stack:
+        node = stack.pop()
+        if node in reachable:
+            continue
+        reachable.add(node)
+        stack.extend(graph.adj[node])
+    return reachable
+
+
 def filter_out_unreachable(graph, nodes, roots):
-    shortest_paths = nx.multi_source_dijkstra_path_length(graph, roots)
+    reachable_from_roots = reachable_nodes(graph, roots)
     reachable = []
     unreachable = []
     for node in nodes:
-        if node not in shortest_paths:
+        if node not in reachable_from_roots:
             unreachable.append(node)
         else:
             reachable.append(node)
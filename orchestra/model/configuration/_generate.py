@@ -1,3 +1,4 @@
+import hashlib
 import json
 import os
 from pathlib import Path
@@ -8,7 +9,7 @@ import jsonschema
 import pkg_resources
 import yaml
 
-from ...actions.util import get_script_output, get_subprocess_output
+from ...actions.util import get_subprocess_output
 from ...exceptions import InternalSubprocessException, YTTException, UserException
 
 
@@ -56,9 +57,19 @@ def generate_yaml_configuration(
 
 
 def hash_config_dir(config_dir):
-    hash_script = f"""find "{config_dir}" -type f -print0 | sort -z | xargs -0 sha1sum | sha1sum"""
-    config_hash = get_script_output(hash_script).strip().partition(" ")[0]
-    return config_hash
+    """Hashes the metadata (path, mtime, size) of all files in the configuration directory.
+    Hashing metadata instead of contents means checking the cache validity does not have to
+    read every configuration file on each invocation.
+    """
+    hasher = hashlib.sha1()
+    for current_dir_path, child_dir_names, child_file_names in os.walk(config_dir):
+        child_dir_names.sort()
+        for child_file_name in sorted(child_file_names):
+            child_file_path = os.path.join(current_dir_path, child_file_name)
+            file_stat = os.stat(child_file_path)
+            relative_path = os.path.relpath(child_file_path, config_dir)
+            hasher.update(f"{relative_path}\0{file_stat.st_mtime_ns}\0{file_stat.st_size}\0".encode())
+    return hasher.hexdigest()
 
 
 def validate_configuration_schema(parsed_config):